@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Monte-Carlo Kernel Module
+JIT-compiled kernel for averaging sampled pairwise similarities.
+Requires numba; HAVE_NUMBA is False if it is not installed.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+if HAVE_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def mc_mean_similarity(matrix, idx_mat):
+        """
+        Calculate the mean pairwise similarity of every sampled index set.
+        
+        Args:
+            matrix: NxN similarity matrix
+            idx_mat: Sampled indices, one row of k distinct indices per iteration
+        
+        Returns:
+            Array with one mean similarity per iteration
+        """
+        n_iterations, k = idx_mat.shape
+        n_pairs = k * (k - 1) // 2
+        out = np.empty(n_iterations, dtype=np.float64)
+        
+        for it in prange(n_iterations):
+            acc = 0.0
+            for i in range(k):
+                row = idx_mat[it, i]
+                for j in range(i + 1, k):
+                    acc += matrix[row, idx_mat[it, j]]
+            out[it] = acc / n_pairs
+        
+        return out
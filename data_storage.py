@@ -6,10 +6,30 @@ Handles persistent storage and retrieval of test results.
 
 import json
 import os
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object to compact UTF-8 encoded JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """Deserialize UTF-8 encoded JSON."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class DataStorage:
     """
@@ -21,42 +41,159 @@ class DataStorage:
         """Save a test result. Must be implemented by subclasses."""
         raise NotImplementedError("Subclasses must implement save_test_result")
     
+    def save_test_results_bulk(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Save several test results at once.
+        Subclasses can override this to write them in one operation.
+        """
+        for test_data in results:
+            self.save_test_result(test_data)
+    
     def load_test_results(self) -> List[Dict[str, Any]]:
         """Load all test results. Must be implemented by subclasses."""
         raise NotImplementedError("Subclasses must implement load_test_results")
     
+    def iter_test_results(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all test results one by one.
+        Subclasses can override this to stream results without building a list.
+        """
+        yield from self.load_test_results()
+    
     def clear_data(self) -> None:
         """Clear all stored data. Must be implemented by subclasses."""
         raise NotImplementedError("Subclasses must implement clear_data")
+    
+    def replace_test_results(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Replace all stored results with the given ones.
+        Subclasses can override this to swap the data in one atomic step.
+        """
+        self.clear_data()
+        self.save_test_results_bulk(results)
+    
+    def batch(self):
+        """
+        Context manager grouping several saves into one write session.
+        Subclasses may override this to buffer writes; the default does nothing.
+        """
+        return nullcontext(self)
 
 
 class JSONDataStorage(DataStorage):
     """
     Concrete implementation of DataStorage using JSON files.
-    Stores test results in a structured JSON format.
+    Stores test results in JSON Lines format (one JSON object per line),
+    so that saving a result only appends to the file.
     """
     
-    def __init__(self, storage_dir: str = "test_data"):
+    def __init__(self, 
+                 storage_dir: str = "test_data", 
+                 flush_every: int = 128,
+                 file_name: str = "test_results"):
         """
         Initialize JSON data storage.
         
         Args:
             storage_dir: Directory where test data will be stored
+            flush_every: Number of buffered results after which a batch is written
+            file_name: Base name of the data file (without extension)
         """
         self._storage_dir = Path(storage_dir)
         self._storage_dir.mkdir(parents=True, exist_ok=True)
-        self._data_file = self._storage_dir / "test_results.json"
+        self._data_file = self._storage_dir / f"{file_name}.jsonl"
+        self._legacy_data_file = self._storage_dir / f"{file_name}.json"
+        self._flush_every = flush_every
+        self._buffer: List[bytes] = []
+        self._fd: Optional[int] = None
+        self._cached: Optional[List[Dict[str, Any]]] = None
         self._ensure_data_file()
     
+    def __enter__(self) -> "JSONDataStorage":
+        """Open the data file for a batch of appends."""
+        if self._fd is None:
+            self._fd = os.open(self._data_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Write remaining buffered results, sync them to disk and close the file."""
+        if self._fd is None:
+            return
+        try:
+            self.flush()
+            os.fsync(self._fd)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+    
+    def batch(self) -> "JSONDataStorage":
+        """
+        Group several saves into one write session.
+        Results are buffered and written in chunks of flush_every lines
+        through a single open file descriptor, with one fsync at the end.
+        
+        Usage:
+            with storage.batch():
+                storage.save_test_result(...)
+        """
+        return self
+    
+    def flush(self) -> None:
+        """Write all buffered results to the data file."""
+        if not self._buffer:
+            return
+        
+        data = b'\n'.join(self._buffer) + b'\n'
+        self._buffer.clear()
+        
+        if self._fd is None:
+            with open(self._data_file, 'ab') as f:
+                f.write(data)
+            return
+        
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+    
     def _ensure_data_file(self) -> None:
         """Ensure the data file exists, create if it doesn't."""
         if not self._data_file.exists():
-            with open(self._data_file, 'w') as f:
-                json.dump([], f)
+            if self._legacy_data_file.exists():
+                self._migrate_legacy_data_file()
+            else:
+                open(self._data_file, 'w').close()
+    
+    def _migrate_legacy_data_file(self) -> None:
+        """Convert results from the old JSON array file into the JSON Lines file."""
+        try:
+            with open(self._legacy_data_file, 'rb') as f:
+                data = _loads(f.read())
+        except (ValueError, IOError):
+            data = []
+        
+        records = data if isinstance(data, list) else []
+        self._write_atomically(self._data_file, b''.join(_dumps(r) + b'\n' for r in records))
+    
+    def _write_atomically(self, path: Path, data: bytes) -> None:
+        """
+        Replace a file's contents without ever leaving it partially written.
+        Data goes to a temporary file first, which is then renamed over the target.
+        
+        Args:
+            path: File to write
+            data: Complete new file contents
+        """
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
     
     def save_test_result(self, test_data: Dict[str, Any]) -> None:
         """
-        Save a test result to the JSON file.
+        Append a test result to the JSON Lines file.
         
         Args:
             test_data: Dictionary containing test result data
@@ -65,37 +202,139 @@ class JSONDataStorage(DataStorage):
         if 'timestamp' not in test_data:
             test_data['timestamp'] = datetime.now().isoformat()
         
-        # Load existing data
-        existing_data = self.load_test_results()
+        line = _dumps(test_data)
+        
+        # Keep the in-memory copy in sync instead of re-reading the file
+        if self._cached is not None:
+            self._cached.append(test_data)
+        
+        # Inside a batch, buffer the line and write in chunks
+        if self._fd is not None:
+            self._buffer.append(line)
+            if len(self._buffer) >= self._flush_every:
+                self.flush()
+            return
+        
+        # Append new test result as a single line
+        with open(self._data_file, 'ab', buffering=1 << 16) as f:
+            f.write(line + b'\n')
+    
+    def save_test_results_bulk(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Append several test results to the JSON Lines file
+        with a single open, write and fsync.
+        
+        Args:
+            results: List of dictionaries containing test result data
+        """
+        if not results:
+            return
+        
+        timestamp = datetime.now().isoformat()
+        for test_data in results:
+            test_data.setdefault('timestamp', timestamp)
+        lines = [_dumps(test_data) for test_data in results]
+        
+        if self._cached is not None:
+            self._cached.extend(results)
         
-        # Append new test result
-        existing_data.append(test_data)
+        # Inside a batch, hand the lines to the batch buffer
+        if self._fd is not None:
+            self._buffer.extend(lines)
+            if len(self._buffer) >= self._flush_every:
+                self.flush()
+            return
         
-        # Save back to file
-        with open(self._data_file, 'w') as f:
-            json.dump(existing_data, f, indent=2, ensure_ascii=False)
+        with open(self._data_file, 'ab') as f:
+            f.write(b'\n'.join(lines) + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
     
     def load_test_results(self) -> List[Dict[str, Any]]:
         """
-        Load all test results from the JSON file.
+        Load all test results from the JSON Lines file.
+        The file is parsed only once; later calls are served from memory.
+        Lines that cannot be parsed (e.g. from an interrupted write) are skipped.
         
         Returns:
             List of test result dictionaries
         """
-        if not self._data_file.exists():
-            return []
+        if self._cached is not None:
+            return list(self._cached)
         
         try:
-            with open(self._data_file, 'r') as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
-        except (json.JSONDecodeError, IOError):
+            results = list(self._iter_data_file())
+        except IOError:
             return []
+        
+        self._cached = results
+        return list(results)
+    
+    def iter_test_results(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all test results, parsing the file line by line.
+        Uses the in-memory copy if results have already been loaded.
+        
+        Yields:
+            Test result dictionaries
+        """
+        if self._cached is not None:
+            yield from list(self._cached)
+            return
+        
+        try:
+            yield from self._iter_data_file()
+        except IOError:
+            return
+    
+    def _iter_data_file(self) -> Iterator[Dict[str, Any]]:
+        """Parse the data file lazily, skipping lines that cannot be parsed."""
+        self.flush()
+        
+        if not self._data_file.exists():
+            return
+        
+        with open(self._data_file, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield _loads(line)
+                except ValueError:
+                    continue
     
     def clear_data(self) -> None:
         """Clear all stored test data."""
-        with open(self._data_file, 'w') as f:
-            json.dump([], f)
+        self._buffer.clear()
+        self._cached = []
+        open(self._data_file, 'w').close()
+    
+    def replace_test_results(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Atomically replace the JSON Lines file with the given results,
+        so a crash leaves either the old or the new contents.
+        
+        Args:
+            results: List of dictionaries containing the new test data
+        """
+        self.flush()
+        self._write_atomically(self._data_file, b''.join(_dumps(r) + b'\n' for r in results))
+        self._cached = list(results)
+        
+        # An open batch descriptor still points at the replaced file
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = os.open(self._data_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+    
+    def export_pretty(self, path: str) -> None:
+        """
+        Export all test results as one indented, human-readable JSON array.
+        
+        Args:
+            path: File path to write the export to
+        """
+        text = json.dumps(self.load_test_results(), indent=2, ensure_ascii=False)
+        self._write_atomically(Path(path), text.encode('utf-8'))
     
     def get_storage_path(self) -> str:
         """Get the path to the storage directory."""
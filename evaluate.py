@@ -47,6 +47,18 @@ def main():
         default=None,
         help='Evaluate only a specific prompt (default: evaluate all)'
     )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Random seed for reproducible Monte-Carlo results (default: random)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of worker processes for per-agent simulations (default: 1, 0 = one per CPU core)'
+    )
     parser.add_argument(
         '--summary-only',
         action='store_true',
@@ -66,7 +78,11 @@ def main():
     else:
         similarity_metric = JaccardSimilarity()
     
-    stability_calculator = StabilityCalculator(similarity_metric=similarity_metric)
+    stability_calculator = StabilityCalculator(
+        similarity_metric=similarity_metric,
+        seed=args.seed,
+        n_workers=args.workers or None
+    )
     
     # Create evaluator
     evaluator = Evaluator(
@@ -75,35 +91,37 @@ def main():
         monte_carlo_iterations=args.iterations
     )
     
-    # Check if data exists
-    test_results = data_storage.load_test_results()
-    if not test_results:
+    # Check if data exists without reading the whole file
+    if next(iter(data_storage.iter_test_results()), None) is None:
         print("No test data found. Please run tests first using uuak.py")
         sys.exit(1)
     
-    print(f"Loaded {len(test_results)} test results")
+    print(f"Loaded {evaluator.get_result_count()} test results")
     print(f"Using {args.metric} similarity metric")
     print(f"Running Monte-Carlo simulation with {args.iterations} iterations...")
     print()
     
     # Generate report
-    if args.summary_only:
-        summary = evaluator.get_summary_statistics()
-        print("=" * 80)
-        print("SUMMARY STATISTICS")
-        print("=" * 80)
-        print(f"Overall Mean Stability: {summary['overall_mean_stability']:.4f}")
-        print(f"Overall Min Stability: {summary['overall_min_stability']:.4f}")
-        print(f"Overall Max Stability: {summary['overall_max_stability']:.4f}")
-        print("\nAgent Averages:")
-        for agent, avg_stability in summary['agent_averages'].items():
-            print(f"  {agent}: {avg_stability:.4f}")
-    else:
-        report = evaluator.generate_report(output_file=args.output)
-        if not args.output:
-            print(report)
+    try:
+        if args.summary_only:
+            summary = evaluator.get_summary_statistics()
+            print("=" * 80)
+            print("SUMMARY STATISTICS")
+            print("=" * 80)
+            print(f"Overall Mean Stability: {summary['overall_mean_stability']:.4f}")
+            print(f"Overall Min Stability: {summary['overall_min_stability']:.4f}")
+            print(f"Overall Max Stability: {summary['overall_max_stability']:.4f}")
+            print("\nAgent Averages:")
+            for agent, avg_stability in summary['agent_averages'].items():
+                print(f"  {agent}: {avg_stability:.4f}")
         else:
-            print(f"Report saved to {args.output}")
+            report = evaluator.generate_report(output_file=args.output)
+            if not args.output:
+                print(report)
+            else:
+                print(f"Report saved to {args.output}")
+    finally:
+        stability_calculator.close()
 
 
 if __name__ == "__main__":
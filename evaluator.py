@@ -14,10 +14,18 @@ class TestResultAggregator:
     """
     Aggregates test results by base prompt and agent.
     Organizes data for stability analysis.
+    Results are stored column-wise; the grouping by prompt and agent
+    is built once on first read and reused until new results are added.
     """
     
     def __init__(self):
-        self._data = {}  # {base_prompt: {agent_name: [responses]}}
+        # One entry per result in each column
+        self._base_prompts: List[str] = []
+        self._agent_names: List[str] = []
+        self._responses: List[str] = []
+        self._style_combinations: List[Optional[str]] = []
+        self._sentiments: List[Optional[Dict]] = []
+        self._grouped: Optional[Dict[str, Dict[str, List[int]]]] = None  # {base_prompt: {agent_name: [row indices]}}
     
     def add_result(self, base_prompt: str, agent_name: str, response: str, 
                    style_combination: str = None, sentiment: Dict = None):
@@ -31,17 +39,21 @@ class TestResultAggregator:
             style_combination: The style combination used
             sentiment: Sentiment analysis results
         """
-        if base_prompt not in self._data:
-            self._data[base_prompt] = {}
-        
-        if agent_name not in self._data[base_prompt]:
-            self._data[base_prompt][agent_name] = []
-        
-        self._data[base_prompt][agent_name].append({
-            'response': response,
-            'style_combination': style_combination,
-            'sentiment': sentiment
-        })
+        self._base_prompts.append(base_prompt)
+        self._agent_names.append(agent_name)
+        self._responses.append(response)
+        self._style_combinations.append(style_combination)
+        self._sentiments.append(sentiment)
+        self._grouped = None
+    
+    def _get_grouped(self) -> Dict[str, Dict[str, List[int]]]:
+        """Build (or reuse) the row index grouped by base prompt and agent."""
+        if self._grouped is None:
+            grouped = {}
+            for row, (base_prompt, agent_name) in enumerate(zip(self._base_prompts, self._agent_names)):
+                grouped.setdefault(base_prompt, {}).setdefault(agent_name, []).append(row)
+            self._grouped = grouped
+        return self._grouped
     
     def get_response_sets(self, base_prompt: str) -> Dict[str, List[str]]:
         """
@@ -53,22 +65,38 @@ class TestResultAggregator:
         Returns:
             Dictionary mapping agent names to lists of response texts
         """
-        if base_prompt not in self._data:
-            return {}
-        
-        response_sets = {}
-        for agent_name, results in self._data[base_prompt].items():
-            response_sets[agent_name] = [r['response'] for r in results]
+        agents = self._get_grouped().get(base_prompt, {})
+        responses = self._responses
         
-        return response_sets
+        return {
+            agent_name: [responses[row] for row in rows]
+            for agent_name, rows in agents.items()
+        }
+    
+    def __len__(self) -> int:
+        """Get the number of aggregated results."""
+        return len(self._responses)
     
     def get_all_prompts(self) -> List[str]:
         """Get all base prompts that have been aggregated."""
-        return list(self._data.keys())
+        return list(self._get_grouped())
     
     def get_full_data(self) -> Dict[str, Dict[str, List[Dict]]]:
         """Get the complete aggregated data structure."""
-        return self._data
+        return {
+            base_prompt: {
+                agent_name: [
+                    {
+                        'response': self._responses[row],
+                        'style_combination': self._style_combinations[row],
+                        'sentiment': self._sentiments[row]
+                    }
+                    for row in rows
+                ]
+                for agent_name, rows in agents.items()
+            }
+            for base_prompt, agents in self._get_grouped().items()
+        }
 
 
 class Evaluator:
@@ -93,14 +121,18 @@ class Evaluator:
         self._stability_calculator = stability_calculator or StabilityCalculator()
         self._monte_carlo_iterations = monte_carlo_iterations
         self._aggregator = TestResultAggregator()
+        self._loaded = False
+        self._cached_eval: Dict[Optional[str], Dict[str, Any]] = {}
     
     def load_and_aggregate_data(self) -> None:
         """
         Load test results from storage and aggregate them by prompt and agent.
+        Data is only loaded once; use reload() to pick up new results.
         """
-        test_results = self._data_storage.load_test_results()
+        if self._loaded:
+            return
         
-        for result in test_results:
+        for result in self._data_storage.iter_test_results():
             base_prompt = result.get('base_prompt', '')
             agent_name = result.get('agent_name', '')
             response = result.get('response', '')
@@ -112,6 +144,22 @@ class Evaluator:
                     base_prompt, agent_name, response, 
                     style_combination, sentiment
                 )
+        
+        self._loaded = True
+    
+    def get_result_count(self) -> int:
+        """Get the number of loaded test results, loading them if necessary."""
+        self.load_and_aggregate_data()
+        return len(self._aggregator)
+    
+    def reload(self) -> None:
+        """
+        Discard aggregated data and cached evaluations and load from storage again.
+        """
+        self._aggregator = TestResultAggregator()
+        self._loaded = False
+        self._cached_eval = {}
+        self.load_and_aggregate_data()
     
     def evaluate_stability(self, base_prompt: str = None) -> Dict[str, Any]:
         """
@@ -152,6 +200,21 @@ class Evaluator:
         
         return results
     
+    def evaluate_stability_cached(self, base_prompt: str = None) -> Dict[str, Any]:
+        """
+        Evaluate stability like evaluate_stability, but run the Monte-Carlo
+        simulation only once per prompt selection.
+        
+        Args:
+            base_prompt: Specific prompt to evaluate (None = evaluate all)
+            
+        Returns:
+            Dictionary containing stability metrics
+        """
+        if base_prompt not in self._cached_eval:
+            self._cached_eval[base_prompt] = self.evaluate_stability(base_prompt)
+        return self._cached_eval[base_prompt]
+    
     def generate_report(self, output_file: str = None) -> str:
         """
         Generate a comprehensive evaluation report.
@@ -163,7 +226,7 @@ class Evaluator:
             Report text as string
         """
         self.load_and_aggregate_data()
-        evaluation_results = self.evaluate_stability()
+        evaluation_results = self.evaluate_stability_cached()
         
         report_lines = []
         report_lines.append("=" * 80)
@@ -210,7 +273,7 @@ class Evaluator:
             Dictionary with summary statistics
         """
         self.load_and_aggregate_data()
-        evaluation_results = self.evaluate_stability()
+        evaluation_results = self.evaluate_stability_cached()
         
         all_stabilities = []
         agent_stabilities = {}
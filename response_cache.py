@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""
+Response Cache Module
+Caches LLM responses by exact prompt and by prompt embedding similarity.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Any, Optional
+
+import numpy as np
+
+from data_storage import JSONDataStorage
+
+
+class ResponseCache:
+    """
+    Two-tier cache for LLM responses.
+    
+    Tier 1 looks up an exact SHA256 key of (model, system prompt, prompt).
+    Tier 2 compares the prompt embedding against all cached prompts of the
+    same model and system prompt and returns the closest response if its
+    cosine similarity reaches the threshold.
+    
+    Only deterministic generations (temperature 0) should be cached;
+    otherwise repeated runs would no longer sample the model.
+    Entries expire after ttl_seconds and the least recently used entry is
+    evicted once max_entries is exceeded. Entries are persisted through a
+    JSONDataStorage so the cache survives between sessions.
+    All methods may be called from several threads at once; embeddings are
+    computed outside the lock so concurrent lookups do not serialize on them.
+    """
+    
+    def __init__(self,
+                 storage_dir: str = "test_data",
+                 max_entries: int = 1000,
+                 ttl_seconds: float = 24 * 3600,
+                 similarity_threshold: Optional[float] = 0.85,
+                 embed: Optional[Callable[[str], List[float]]] = None):
+        """
+        Initialize the response cache.
+        
+        Args:
+            storage_dir: Directory where cache entries are stored
+            max_entries: Maximum number of cached responses
+            ttl_seconds: Time after which an entry expires
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+                                  (None = exact matches only)
+            embed: Function returning an embedding vector for a prompt
+        """
+        self._storage = JSONDataStorage(storage_dir=storage_dir, file_name="response_cache")
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._similarity_threshold = similarity_threshold
+        self._embed = embed
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._miss_embeddings: Dict[str, Optional[List[float]]] = {}  # computed in get, reused in put
+        self._lock = threading.Lock()
+        self._load()
+    
+    @staticmethod
+    def make_key(model: str, system_prompt: Optional[str], prompt: str) -> str:
+        """Build the exact-match cache key for a request."""
+        return hashlib.sha256(f"{model}|{system_prompt}|{prompt}".encode()).hexdigest()
+    
+    def _load(self) -> None:
+        """Load persisted entries; later records for the same key win."""
+        n_records = 0
+        for entry in self._storage.iter_test_results():
+            n_records += 1
+            self._entries.pop(entry['key'], None)
+            self._entries[entry['key']] = entry
+        
+        self._expire()
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        
+        # Compact the append-only file once it is mostly stale records
+        if n_records > 2 * max(len(self._entries), 1):
+            self._storage.replace_test_results(list(self._entries.values()))
+    
+    def _expire(self) -> None:
+        """Drop all entries older than the TTL. Callers must hold the lock."""
+        cutoff = time.time() - self._ttl_seconds
+        for key in [k for k, e in self._entries.items() if e['created_at'] < cutoff]:
+            del self._entries[key]
+    
+    def _embedding(self, prompt: str) -> Optional[List[float]]:
+        """Get the embedding of a prompt, or None if no embedding is available."""
+        if self._embed is None or self._similarity_threshold is None:
+            return None
+        try:
+            return list(self._embed(prompt))
+        except Exception:
+            return None
+    
+    def get(self, model: str, system_prompt: Optional[str], prompt: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            model: Model name
+            system_prompt: System prompt used for the request
+            prompt: User prompt
+        
+        Returns:
+            Cached response text, or None on a miss
+        """
+        key = self.make_key(model, system_prompt, prompt)
+        
+        # Tier 1: exact match
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry['response']
+        
+        # Tier 2: most similar prompt of the same model and system prompt
+        embedding = self._embedding(prompt)
+        if embedding is None:
+            return None
+        
+        with self._lock:
+            self._miss_embeddings[key] = embedding
+            candidates = [
+                e for e in self._entries.values()
+                if e['model'] == model and e['system_prompt'] == system_prompt
+                and e.get('embedding') and len(e['embedding']) == len(embedding)
+            ]
+            if not candidates:
+                return None
+            
+            vectors = np.asarray([e['embedding'] for e in candidates], dtype=np.float32)
+            query = np.asarray(embedding, dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+            similarities = vectors @ query / np.where(norms > 0, norms, 1.0)
+            
+            best = int(np.argmax(similarities))
+            if similarities[best] < self._similarity_threshold:
+                return None
+            
+            self._miss_embeddings.pop(key, None)
+            self._entries.move_to_end(candidates[best]['key'])
+            return candidates[best]['response']
+    
+    def put(self, model: str, system_prompt: Optional[str], prompt: str, response: str) -> None:
+        """
+        Store a response in the cache.
+        
+        Args:
+            model: Model name
+            system_prompt: System prompt used for the request
+            prompt: User prompt
+            response: Response text to cache
+        """
+        key = self.make_key(model, system_prompt, prompt)
+        with self._lock:
+            embedding = self._miss_embeddings.pop(key, None)
+        if embedding is None:
+            embedding = self._embedding(prompt)
+        
+        entry = {
+            'key': key,
+            'model': model,
+            'system_prompt': system_prompt,
+            'prompt': prompt,
+            'response': response,
+            'embedding': embedding,
+            'created_at': time.time()
+        }
+        
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            
+            self._storage.save_test_result(entry)
@@ -4,12 +4,24 @@ Stability Calculator Module
 Calculates prompt stability using various metrics and Monte-Carlo simulation.
 """
 
-import random
+import os
+import multiprocessing
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from scipy.sparse import csr_matrix
+from typing import List, Dict, Any, Tuple, Optional
 from collections import Counter
+from functools import lru_cache
 from abc import ABC, abstractmethod
 
+import _mc_kernel
+
+
+@lru_cache(maxsize=4096)
+def _word_set(text: str) -> frozenset:
+    """Tokenize a response into its set of lowercase words (cached per text)."""
+    return frozenset(text.lower().split())
+
 
 class SimilarityMetric(ABC):
     """
@@ -30,6 +42,27 @@ class SimilarityMetric(ABC):
             Similarity score between 0 and 1 (1 = identical, 0 = completely different)
         """
         pass
+    
+    def similarity_matrix(self, responses: List[str]) -> np.ndarray:
+        """
+        Calculate the full NxN similarity matrix for a list of responses.
+        Subclasses can override this with a vectorized implementation.
+        
+        Args:
+            responses: List of response texts
+            
+        Returns:
+            Symmetric float32 matrix of pairwise similarity scores
+        """
+        n = len(responses)
+        matrix = np.ones((n, n), dtype=np.float32)
+        
+        for i in range(n):
+            for j in range(i + 1, n):
+                sim = self.calculate(responses[i], responses[j])
+                matrix[i, j] = matrix[j, i] = sim
+        
+        return matrix
 
 
 class JaccardSimilarity(SimilarityMetric):
@@ -37,18 +70,131 @@ class JaccardSimilarity(SimilarityMetric):
     Jaccard similarity based on word sets.
     """
     
+    # Up to this many responses, bitmask popcounts beat the sparse matmul setup cost
+    BITSET_MAX_RESPONSES = 32
+    
     def calculate(self, response1: str, response2: str) -> float:
         """Calculate Jaccard similarity of word sets."""
-        words1 = set(response1.lower().split())
-        words2 = set(response2.lower().split())
+        words1 = _word_set(response1)
+        words2 = _word_set(response2)
         
         if not words1 and not words2:
             return 1.0
         
         intersection = len(words1 & words2)
-        union = len(words1 | words2)
+        union = len(words1) + len(words2) - intersection
         
         return intersection / union if union > 0 else 0.0
+    
+    def _build_token_matrix(self, responses: List[str]) -> Tuple[csr_matrix, np.ndarray]:
+        """
+        Build a sparse binary term-document matrix (one row per response).
+        
+        Args:
+            responses: List of response texts
+            
+        Returns:
+            Tuple of (CSR matrix, number of distinct words per response)
+        """
+        vocabulary = {}
+        indices = []
+        indptr = [0]
+        
+        for response in responses:
+            words = _word_set(response)
+            indices.extend(vocabulary.setdefault(w, len(vocabulary)) for w in words)
+            indptr.append(len(indices))
+        
+        data = np.ones(len(indices), dtype=np.int32)
+        csr = csr_matrix((data, indices, indptr), 
+                         shape=(len(responses), max(len(vocabulary), 1)))
+        sizes = np.asarray(csr.sum(axis=1)).ravel()
+        return csr, sizes
+    
+    def _jaccard_matrix(self, csr: csr_matrix, sizes: np.ndarray) -> np.ndarray:
+        """
+        Calculate all pairwise Jaccard similarities from a term-document matrix.
+        
+        Args:
+            csr: Binary term-document matrix
+            sizes: Number of distinct words per row
+            
+        Returns:
+            Dense float32 similarity matrix
+        """
+        intersection = (csr @ csr.T).toarray()
+        union = sizes[:, None] + sizes[None, :] - intersection
+        
+        # Two empty responses count as identical
+        with np.errstate(divide='ignore', invalid='ignore'):
+            matrix = np.where(union > 0, intersection / union, 1.0)
+        return matrix.astype(np.float32)
+    
+    def _build_bitmasks(self, responses: List[str]) -> Tuple[List[int], List[int]]:
+        """
+        Encode each response's word set as an integer bitmask over a shared vocabulary.
+        
+        Args:
+            responses: List of response texts
+            
+        Returns:
+            Tuple of (bitmask per response, number of distinct words per response)
+        """
+        vocabulary = {}
+        word_ids = [
+            [vocabulary.setdefault(w, len(vocabulary)) for w in _word_set(response)]
+            for response in responses
+        ]
+        
+        n_bytes = len(vocabulary) // 8 + 1
+        masks = []
+        for ids in word_ids:
+            bits = bytearray(n_bytes)
+            for i in ids:
+                bits[i >> 3] |= 1 << (i & 7)
+            masks.append(int.from_bytes(bits, 'little'))
+        
+        sizes = [len(ids) for ids in word_ids]
+        return masks, sizes
+    
+    def _jaccard_matrix_bitset(self, masks: List[int], sizes: List[int]) -> np.ndarray:
+        """
+        Calculate all pairwise Jaccard similarities from word bitmasks.
+        Intersection sizes are popcounts of the AND of two masks.
+        
+        Args:
+            masks: Word bitmask per response
+            sizes: Number of distinct words per response
+            
+        Returns:
+            Dense float32 similarity matrix
+        """
+        n = len(masks)
+        matrix = np.ones((n, n), dtype=np.float32)
+        
+        for i in range(n):
+            mask_i = masks[i]
+            size_i = sizes[i]
+            for j in range(i + 1, n):
+                intersection = (mask_i & masks[j]).bit_count()
+                union = size_i + sizes[j] - intersection
+                
+                # Two empty responses count as identical
+                matrix[i, j] = matrix[j, i] = intersection / union if union > 0 else 1.0
+        
+        return matrix
+    
+    def similarity_matrix(self, responses: List[str]) -> np.ndarray:
+        """
+        Calculate Jaccard similarities for all pairs.
+        Small response sets use bitmask popcounts, larger ones a single sparse matmul.
+        """
+        if len(responses) <= self.BITSET_MAX_RESPONSES:
+            masks, sizes = self._build_bitmasks(responses)
+            return self._jaccard_matrix_bitset(masks, sizes)
+        
+        csr, sizes = self._build_token_matrix(responses)
+        return self._jaccard_matrix(csr, sizes)
 
 
 class LengthSimilarity(SimilarityMetric):
@@ -68,6 +214,30 @@ class LengthSimilarity(SimilarityMetric):
         min_len = min(len1, len2)
         
         return min_len / max_len if max_len > 0 else 0.0
+    
+    def similarity_matrix(self, responses: List[str]) -> np.ndarray:
+        """Calculate length ratios for all pairs via outer min/max."""
+        lens = np.fromiter(map(len, responses), dtype=np.int32, count=len(responses))
+        min_len = np.minimum.outer(lens, lens)
+        max_len = np.maximum.outer(lens, lens)
+        
+        # Two empty responses count as identical
+        with np.errstate(divide='ignore', invalid='ignore'):
+            matrix = np.where(max_len > 0, min_len / max_len, 1.0)
+        return matrix.astype(np.float32)
+
+
+def _mc_one_agent(similarity_metric: SimilarityMetric, 
+                  responses: List[str], 
+                  n_iterations: int, 
+                  sample_size: int, 
+                  seed: int) -> np.ndarray:
+    """
+    Run the Monte-Carlo simulation for a single agent.
+    Module-level so it can be dispatched to worker processes.
+    """
+    calculator = StabilityCalculator(similarity_metric=similarity_metric, seed=seed)
+    return calculator._sample_stability_scores(responses, n_iterations, sample_size)
 
 
 class StabilityCalculator:
@@ -76,34 +246,229 @@ class StabilityCalculator:
     Stability measures how consistent model responses are across different style variations.
     """
     
-    def __init__(self, similarity_metric: SimilarityMetric = None):
+    # Upper bound on the elements of one (rows, k, k) block of sampled submatrices
+    MC_BLOCK_ELEMENTS = 1 << 22
+    
+    def __init__(self, 
+                 similarity_metric: SimilarityMetric = None, 
+                 seed: Optional[int] = None,
+                 n_workers: Optional[int] = 1):
         """
         Initialize stability calculator.
         
         Args:
             similarity_metric: Metric to use for comparing responses
+            seed: Seed for the Monte-Carlo random generator (None = random)
+            n_workers: Number of worker processes for per-agent simulations
+                       (1 = run serially, None = one per CPU core)
         """
         self._similarity_metric = similarity_metric or JaccardSimilarity()
+        self._sim_cache: Dict[Tuple[str, ...], np.ndarray] = {}
+        self._triu_cache: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._rng = np.random.default_rng(seed)
+        self._n_workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def close(self) -> None:
+        """Shut down the worker process pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
     
-    def calculate_pairwise_similarity(self, responses: List[str]) -> List[float]:
+    def _sample_all_agents(self, 
+                           response_sets: Dict[str, List[str]], 
+                           n_iterations: int) -> Dict[str, np.ndarray]:
         """
-        Calculate pairwise similarities between all responses.
+        Run the Monte-Carlo simulation for every agent with at least two responses.
+        Agents are independent, so with n_workers > 1 they run in a process pool.
+        
+        Args:
+            response_sets: Dictionary mapping agent names to lists of responses
+            n_iterations: Number of Monte-Carlo iterations
+            
+        Returns:
+            Dictionary mapping agent names to per-iteration stability scores
+        """
+        jobs = {
+            agent_name: (responses, max(2, len(responses) // 2))
+            for agent_name, responses in response_sets.items()
+            if len(responses) >= 2
+        }
+        
+        # Independent, reproducible seed per agent derived from the main generator,
+        # so results do not depend on whether agents run serially or in a pool
+        seeds = self._rng.integers(np.iinfo(np.int64).max, size=len(jobs))
+        
+        if self._n_workers <= 1 or len(jobs) <= 1:
+            return {
+                agent_name: self._sample_stability_scores(
+                    responses, n_iterations, sample_size, rng=np.random.default_rng(int(seed))
+                )
+                for (agent_name, (responses, sample_size)), seed in zip(jobs.items(), seeds)
+            }
+        
+        if self._executor is None:
+            # Spawn instead of fork: forking after the Numba kernel started
+            # its thread pool can deadlock or kill the workers
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._n_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        
+        futures = {
+            self._executor.submit(
+                _mc_one_agent, self._similarity_metric, 
+                responses, n_iterations, sample_size, int(seed)
+            ): agent_name
+            for (agent_name, (responses, sample_size)), seed in zip(jobs.items(), seeds)
+        }
+        
+        scores = {}
+        for future in as_completed(futures):
+            scores[futures[future]] = future.result()
+        return scores
+    
+    def _intern_responses(self, responses: List[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        Map responses to a table of unique response texts.
         
         Args:
             responses: List of response texts
             
         Returns:
-            List of similarity scores for all pairs
+            Tuple of (unique responses, index into the unique responses per response)
+        """
+        uniq_idx: Dict[str, int] = {}
+        u_ids = np.fromiter(
+            (uniq_idx.setdefault(r, len(uniq_idx)) for r in responses),
+            dtype=np.int32, count=len(responses)
+        )
+        return list(uniq_idx), u_ids
+    
+    def _get_similarity_matrix(self, responses: List[str]) -> np.ndarray:
+        """
+        Get the full similarity matrix for a response list, computing it only once.
+        Similarities are computed on unique responses only and expanded afterwards.
+        
+        Args:
+            responses: List of response texts
+            
+        Returns:
+            Cached NxN similarity matrix
+        """
+        key = tuple(responses)
+        matrix = self._sim_cache.get(key)
+        
+        if matrix is None:
+            uniques, u_ids = self._intern_responses(responses)
+            matrix = self._similarity_metric.similarity_matrix(uniques)
+            
+            if len(uniques) < len(responses):
+                matrix = matrix[np.ix_(u_ids, u_ids)]
+            
+            self._sim_cache[key] = matrix
+        
+        return matrix
+    
+    def _sample_stability_scores(self, 
+                                 responses: List[str], 
+                                 n_iterations: int, 
+                                 sample_size: int,
+                                 rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Draw Monte-Carlo samples and return the stability score of each sample.
+        Samples are drawn as index matrices into the precomputed similarity
+        matrix and reduced in vectorized blocks of iterations, so memory
+        stays bounded by MC_BLOCK_ELEMENTS regardless of n_iterations.
+        
+        Args:
+            responses: List of response texts
+            n_iterations: Number of Monte-Carlo iterations
+            sample_size: Number of responses per sample
+            rng: Random generator to draw from (default: the calculator's own)
+            
+        Returns:
+            Array with one stability score per iteration, or a single score
+            if every iteration would produce the same result
         """
-        similarities = []
         n = len(responses)
+        k = min(sample_size, n)
         
-        for i in range(n):
-            for j in range(i + 1, n):
-                sim = self._similarity_metric.calculate(responses[i], responses[j])
-                similarities.append(sim)
+        # Single or identical responses are perfectly stable
+        if k < 2 or len(set(responses)) == 1:
+            return np.ones(1)
+        
+        # Every sample contains all responses, so one evaluation suffices
+        if k == n:
+            return np.array([self.calculate_stability_score(responses)])
+        
+        rng = rng or self._rng
+        matrix = self._get_similarity_matrix(responses)
+        indices = np.arange(n)
+        rows, cols = self._triu_indices(k)
+        block_rows = max(1, self.MC_BLOCK_ELEMENTS // max(k * k, n))
+        scores = np.empty(n_iterations, dtype=np.float64)
+        
+        for start in range(0, n_iterations, block_rows):
+            stop = min(start + block_rows, n_iterations)
+            
+            # One row of k distinct indices per iteration
+            idx_mat = rng.permuted(
+                np.broadcast_to(indices, (stop - start, n)), axis=1
+            )[:, :k]
+            
+            if _mc_kernel.HAVE_NUMBA:
+                scores[start:stop] = _mc_kernel.mc_mean_similarity(matrix, np.ascontiguousarray(idx_mat))
+                continue
+            
+            # Gather the sampled submatrices of this block: shape (rows, k, k)
+            sub_matrices = matrix[idx_mat[:, :, None], idx_mat[:, None, :]]
+            scores[start:stop] = sub_matrices[:, rows, cols].mean(axis=1, dtype=np.float64)
         
-        return similarities
+        return scores
+    
+    def _summarize_scores(self, stability_scores: np.ndarray) -> Dict[str, float]:
+        """
+        Reduce per-iteration stability scores to summary metrics.
+        The standard deviation is derived from the variance instead of a separate pass.
+        
+        Args:
+            stability_scores: Array with one stability score per iteration
+            
+        Returns:
+            Dictionary with mean, variance, std_dev, min and max stability
+        """
+        mean_stability = float(stability_scores.mean())
+        deviations = stability_scores - mean_stability
+        variance = float(np.dot(deviations, deviations) / stability_scores.size)
+        
+        return {
+            'mean_stability': mean_stability,
+            'variance': variance,
+            'std_dev': float(np.sqrt(variance)),
+            'min_stability': float(stability_scores.min()),
+            'max_stability': float(stability_scores.max())
+        }
+    
+    def _triu_indices(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the (cached) row and column indices of all pairs i < j for n items."""
+        indices = self._triu_cache.get(n)
+        if indices is None:
+            indices = np.triu_indices(n, k=1)
+            self._triu_cache[n] = indices
+        return indices
+    
+    def calculate_pairwise_similarity(self, responses: List[str]) -> np.ndarray:
+        """
+        Calculate pairwise similarities between all responses.
+        
+        Args:
+            responses: List of response texts
+            
+        Returns:
+            Float32 array of similarity scores for all pairs
+        """
+        matrix = self._get_similarity_matrix(responses)
+        return matrix[self._triu_indices(len(responses))]
     
     def calculate_stability_score(self, responses: List[str]) -> float:
         """
@@ -121,11 +486,11 @@ class StabilityCalculator:
         
         similarities = self.calculate_pairwise_similarity(responses)
         
-        if not similarities:
+        if similarities.size == 0:
             return 0.0
         
         # Average similarity is the stability score
-        return np.mean(similarities)
+        return float(similarities.mean(dtype=np.float64))
     
     def monte_carlo_stability(self, 
                              response_sets: Dict[str, List[str]], 
@@ -150,21 +515,13 @@ class StabilityCalculator:
                 results[agent_name] = 1.0
                 continue
             
-            stability_scores = []
-            
-            for _ in range(n_iterations):
-                # Sample responses (with replacement if sample_size is specified)
-                if sample_size and sample_size < len(responses):
-                    sampled = random.sample(responses, min(sample_size, len(responses)))
-                else:
-                    sampled = responses
-                
-                # Calculate stability for this sample
-                stability = self.calculate_stability_score(sampled)
-                stability_scores.append(stability)
+            # Sample responses (all of them if no sample_size is specified)
+            stability_scores = self._sample_stability_scores(
+                responses, n_iterations, sample_size or len(responses)
+            )
             
             # Mean stability across all iterations
-            results[agent_name] = np.mean(stability_scores)
+            results[agent_name] = float(stability_scores.mean())
         
         return results
     
@@ -189,17 +546,13 @@ class StabilityCalculator:
                 results[agent_name] = 0.0
                 continue
             
-            stability_scores = []
-            
-            for _ in range(n_iterations):
-                # Sample a subset of responses
-                sample_size = max(2, len(responses) // 2)
-                sampled = random.sample(responses, min(sample_size, len(responses)))
-                
-                stability = self.calculate_stability_score(sampled)
-                stability_scores.append(stability)
+            # Sample a subset of responses
+            sample_size = max(2, len(responses) // 2)
+            stability_scores = self._sample_stability_scores(
+                responses, n_iterations, sample_size
+            )
             
-            results[agent_name] = np.var(stability_scores)
+            results[agent_name] = float(stability_scores.var())
         
         return results
     
@@ -217,35 +570,15 @@ class StabilityCalculator:
             Dictionary mapping agent names to metric dictionaries
         """
         results = {}
+        agent_scores = self._sample_all_agents(response_sets, n_iterations)
         
         for agent_name, responses in response_sets.items():
             if len(responses) < 2:
-                results[agent_name] = {
-                    'mean_stability': 1.0,
-                    'variance': 0.0,
-                    'std_dev': 0.0
-                }
+                # Single response is perfectly stable
+                results[agent_name] = self._summarize_scores(np.ones(1))
                 continue
             
-            stability_scores = []
-            
-            for _ in range(n_iterations):
-                sample_size = max(2, len(responses) // 2)
-                sampled = random.sample(responses, min(sample_size, len(responses)))
-                stability = self.calculate_stability_score(sampled)
-                stability_scores.append(stability)
-            
-            mean_stability = np.mean(stability_scores)
-            variance = np.var(stability_scores)
-            std_dev = np.std(stability_scores)
-            
-            results[agent_name] = {
-                'mean_stability': mean_stability,
-                'variance': variance,
-                'std_dev': std_dev,
-                'min_stability': np.min(stability_scores),
-                'max_stability': np.max(stability_scores)
-            }
+            results[agent_name] = self._summarize_scores(agent_scores[agent_name])
         
         return results
 
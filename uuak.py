@@ -2,16 +2,36 @@
 
 import random
 import os
+import re
+import sys
+import asyncio
+import contextlib
+import contextvars
+import functools
+import hashlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import httpx
+import numpy as np
 import ollama
 import nltk
+try:
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+except ImportError:
+    SentimentIntensityAnalyzer = None
 from data_storage import JSONDataStorage
+from response_cache import ResponseCache
 
 
 class Modifier:
 
+    __slots__ = ('_high', '_low', '_table', '_phrases')
+
     def __init__(self, high, low, min=-2, max=2):
-        self._high = high
-        self._low  = low
+        self._high    = high
+        self._low     = low
+        # All possible outputs of quant, built once
+        self._table   = {v: self._format(v) for v in (-2, -1, 0, 1, 2)}
+        self._phrases = tuple(self._table[v] for v in (-2, -1, 1, 2))
 
     def QUANT_STR(self, value):
         value = abs(value)
@@ -24,7 +44,7 @@ class Modifier:
         else:
             raise ValueError("Value must be -2, -1, 0, 1, or 2.")
 
-    def quant(self, value):
+    def _format(self, value):
         if value > 0:
             return f"{self.QUANT_STR(value)}{self._high}"
         elif value < 0:
@@ -32,11 +52,17 @@ class Modifier:
         else:
             return ""
 
+    def quant(self, value):
+        try:
+            return self._table[value]
+        except KeyError:
+            raise ValueError("Value must be -2, -1, 0, 1, or 2.") from None
+
     def random_value(self):
         return random.choice([-2, -1, 1, 2])
 
     def random_quant_str(self):
-        return self.quant(self.random_value())
+        return random.choice(self._phrases)
 
 
 MODIFIERS = [
@@ -49,9 +75,13 @@ MODIFIERS = [
     Modifier('enthusiastic', 'reserved'),
 ]
 
+_RNG = np.random.default_rng()
+
 def pick_random_combination(n=3):
-    sample = random.sample(MODIFIERS, n)
-    return ", ".join([m.random_quant_str() for m in sample])
+    # Draw the n distinct modifiers and their phrases in two vectorized calls
+    mod_idx    = _RNG.choice(len(MODIFIERS), size=n, replace=False)
+    phrase_idx = _RNG.integers(0, 4, size=n)
+    return ", ".join([MODIFIERS[m]._phrases[p] for m, p in zip(mod_idx, phrase_idx)])
 
 
 
@@ -60,10 +90,66 @@ def pull_model(model):
     pass
 
 
+@functools.lru_cache(maxsize=1)
+def _ollama_list():
+    # Available models rarely change while the program runs
+    return ollama.list()
+
+
+def _extract_model_names(obj):
+    """
+    Yield model names from any nesting of lists and dicts, e.g. a plain
+    list of names, {'models': [{'name': ...}, ...]} or similar structures.
+    """
+    if hasattr(obj, "model_dump"):
+        obj = obj.model_dump()
+
+    if isinstance(obj, dict):
+        name = obj.get('name') or obj.get('model') or obj.get('id')
+        if isinstance(name, str):
+            yield name
+            return
+        for value in obj.values():
+            if isinstance(value, (dict, list)):
+                yield from _extract_model_names(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            if isinstance(item, str):
+                yield item
+            else:
+                yield from _extract_model_names(item)
+
+
+# First column of `ollama list`, without the header line
+_OLLAMA_LIST_RE = re.compile(r"(?im)^(?!(?:name|model)(?:\s|$)|---)(\S+)")
+
+
+def _models_from_api(debug=False):
+    response = _ollama_list()
+    
+    if debug:
+        print(f"DEBUG: Response type: {type(response)}")
+        print(f"DEBUG: Response content: {response}")
+    
+    return list(dict.fromkeys(_extract_model_names(response)))
+
+
+def _models_from_cli(debug=False):
+    import subprocess
+    result = subprocess.run(['ollama', 'list'], 
+                          capture_output=True, 
+                          text=True, 
+                          timeout=5)
+    if result.returncode != 0:
+        return []
+    return list(dict.fromkeys(_OLLAMA_LIST_RE.findall(result.stdout)))
+
+
 def get_available_ollama_models(debug=False):
     """
     Get list of all available Ollama models.
-    Tries Python API first, falls back to command line.
+    Queries the Python API and the command line concurrently and returns
+    the first non-empty answer, preferring the API if both are ready.
     
     Args:
         debug: If True, print debug information about the API response
@@ -71,92 +157,51 @@ def get_available_ollama_models(debug=False):
     Returns:
         List of model names (strings)
     """
-    models_list = []
-    
-    # Method 1: Try Python API
-    try:
-        response = ollama.list()
-        
-        if debug:
-            print(f"DEBUG: Response type: {type(response)}")
-            print(f"DEBUG: Response content: {response}")
-        
-        # Handle different possible response structures
-        # Case 1: Direct list of models
-        if isinstance(response, list):
-            for model in response:
-                if isinstance(model, dict):
-                    name = model.get('name') or model.get('model') or model.get('id')
-                    if name:
-                        models_list.append(name)
-                elif isinstance(model, str):
-                    models_list.append(model)
-        
-        # Case 2: Dictionary with 'models' key
-        elif isinstance(response, dict):
-            if 'models' in response:
-                models_data = response['models']
-                if isinstance(models_data, list):
-                    for model in models_data:
-                        if isinstance(model, dict):
-                            name = model.get('name') or model.get('model') or model.get('id')
-                            if name:
-                                models_list.append(name)
-                        elif isinstance(model, str):
-                            models_list.append(model)
-            else:
-                # Case 3: Dictionary without 'models' key - check all values
-                for key, value in response.items():
-                    if isinstance(value, list):
-                        for item in value:
-                            if isinstance(item, dict):
-                                name = item.get('name') or item.get('model') or item.get('id')
-                                if name:
-                                    models_list.append(name)
-                            elif isinstance(item, str):
-                                models_list.append(item)
-        
-        if models_list:
-            return list(dict.fromkeys(models_list))
-            
-    except Exception as e:
-        if debug:
-            print(f"DEBUG: Python API failed: {e}")
+    executor = ThreadPoolExecutor(max_workers=2)
+    pending  = {
+        executor.submit(_models_from_api, debug): "Python API",
+        executor.submit(_models_from_cli, debug): "Command line fallback",
+    }
     
-    # Method 2: Fallback to command line
     try:
-        import subprocess
-        result = subprocess.run(['ollama', 'list'], 
-                              capture_output=True, 
-                              text=True, 
-                              timeout=5)
-        if result.returncode == 0:
-            lines = result.stdout.strip().split('\n')
-            # Skip header line (usually "NAME" or similar)
-            for line in lines[1:]:
-                if line.strip():
-                    # Extract model name (first column)
-                    parts = line.split()
-                    if parts:
-                        model_name = parts[0]
-                        # Skip header-like entries
-                        if model_name.lower() not in ['name', 'model', '---']:
-                            models_list.append(model_name)
-            
-            if models_list:
-                return list(dict.fromkeys(models_list))
-    except FileNotFoundError:
-        if debug:
-            print("DEBUG: 'ollama' command not found in PATH")
-    except Exception as e:
-        if debug:
-            print(f"DEBUG: Command line fallback failed: {e}")
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in [f for f in pending if f in done]:
+                source = pending.pop(future)
+                try:
+                    models_list = future.result()
+                except FileNotFoundError:
+                    if debug:
+                        print("DEBUG: 'ollama' command not found in PATH")
+                except Exception as e:
+                    if debug:
+                        print(f"DEBUG: {source} failed: {e}")
+                else:
+                    if models_list:
+                        return models_list
+    finally:
+        # Do not wait for the slower method
+        executor.shutdown(wait=False)
     
     return []
 
 
+def _ollama_client_options():
+    # Keep-alive pool shared by all requests of a client; the host defaults to OLLAMA_HOST
+    return {
+        "timeout": httpx.Timeout(None, connect=5.0),
+        "limits":  httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    }
+
+
+# AsyncClient of the running event loop, set by TestFramework._async_client
+_ASYNC_CLIENT = contextvars.ContextVar("_ASYNC_CLIENT", default=None)
+
+
 class Agent:
 
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -166,30 +211,77 @@ class Agent:
     def ask(self, prompt):
         raise NotImplementedError("Subclasses should implement this method.")
 
+    async def aask(self, prompt):
+        # Default: run the blocking ask in a worker thread
+        return await asyncio.to_thread(self.ask, prompt)
+
 
 class OllamaAgent(Agent):
 
-    def __init__(self, model, system_prompt=None):
+    __slots__ = ('model', 'system_prompt', 'temperature', '_client', '_aclient', '_cache')
+
+    def __init__(self, model, system_prompt=None, temperature=None, cache=None,
+                 client=None, aclient=None):
         super().__init__()
         self.model         = model
         self.system_prompt = system_prompt
+        self.temperature   = temperature
+        self._client       = client or ollama.Client(**_ollama_client_options())
+        # An AsyncClient is bound to the event loop it was first used in,
+        # so by default aask uses the client of the current run instead
+        self._aclient      = aclient
+        # Caching is only sound for deterministic generation
+        self._cache        = cache if temperature == 0 else None
         pull_model(model)
 
     def name(self):
         return f"ollama/{self.model}"
 
-    def ask(self, prompt):
+    def _chat_args(self, prompt):
+        # Invariant system message first, so the server can reuse its KV cache
+        messages = [{"role": "user", "content": prompt}]
         if self.system_prompt:
-            full_prompt = f"{self.system_prompt}\n\n{prompt}"
+            messages.insert(0, {"role": "system", "content": self.system_prompt})
+
+        args = {"model": self.model, "messages": messages}
+        if self.temperature is not None:
+            args["options"] = {"temperature": self.temperature}
+        return args
+
+    def ask(self, prompt):
+        if self._cache is not None:
+            cached = self._cache.get(self.model, self.system_prompt, prompt)
+            if cached is not None:
+                return ollama.Message(role="assistant", content=cached)
+
+        response = self._client.chat(**self._chat_args(prompt))
+
+        if self._cache is not None:
+            self._cache.put(self.model, self.system_prompt, prompt, response['message']['content'])
+        return response['message']
+
+    async def aask(self, prompt):
+        if self._cache is not None:
+            cached = await asyncio.to_thread(self._cache.get, self.model, self.system_prompt, prompt)
+            if cached is not None:
+                return ollama.Message(role="assistant", content=cached)
+
+        aclient = self._aclient or _ASYNC_CLIENT.get()
+        if aclient is not None:
+            response = await aclient.chat(**self._chat_args(prompt))
         else:
-            full_prompt = prompt
+            async with ollama.AsyncClient(**_ollama_client_options()) as aclient:
+                response = await aclient.chat(**self._chat_args(prompt))
 
-        response = ollama.chat(model=self.model, messages=[{"role": "user", "content": full_prompt}])
+        if self._cache is not None:
+            await asyncio.to_thread(self._cache.put, self.model, self.system_prompt, prompt, response['message']['content'])
         return response['message']
 
 
 class SpecializedQuery:
 
+    __slots__ = ('tf', 'agent', 'base_prompt', 'combination')
+
     def __init__(self, tf, agent, base_prompt, combination):
         self.tf           = tf
         self.agent        = agent
@@ -197,9 +289,7 @@ class SpecializedQuery:
         self.combination  = combination
 
     def full_prompt(self):
-        prompt  = self.base_prompt
-        prompt += " Please answer in a {} manner.".format(self.combination)
-        return prompt
+        return f"{self.base_prompt} Please answer in a {self.combination} manner."
 
     def run(self):
         prompt    = self.full_prompt()
@@ -209,6 +299,8 @@ class SpecializedQuery:
 
 class Database:
 
+    __slots__ = ('_directory',)
+
     def _ensure_exists(self):
         if not os.path.exists(self._directory):
             os.makedirs(self._directory)
@@ -220,25 +312,64 @@ class Database:
 
 
 def create_sia():
-    from nltk.sentiment import SentimentIntensityAnalyzer
-    nltk.download(['vader_lexicon'],quiet=False)
+    if SentimentIntensityAnalyzer is None:
+        raise ImportError("nltk.sentiment.vader is not available")
+    # Only download the lexicon if it is not installed yet
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        nltk.download(['vader_lexicon'], quiet=True)
     sia = SentimentIntensityAnalyzer()
     return sia
 
+
+# VADER splits on whitespace, so collapsing it never changes a score
+_WS_RE = re.compile(r"\s+")
+
+
+# One analyzer per process, shared by all TestFramework instances
+_SIA_SINGLETON = None
+
+def get_sia():
+    global _SIA_SINGLETON
+    if _SIA_SINGLETON is None:
+        _SIA_SINGLETON = create_sia()
+    return _SIA_SINGLETON
+
+
+def _worker_init():
+    # Load the lexicon once per sentiment worker process
+    get_sia()
+
+def _score(text):
+    return get_sia().polarity_scores(text)
+
 class TestFramework:
 
-    def __init__(self, system_prompt="You are a helpful assistant.", data_storage=None):
-        self._agents        = list()
-        self._system_prompt = system_prompt
-        self._sia           = create_sia()
-        self._data_storage  = data_storage or JSONDataStorage()
+    # Batches with fewer unique texts are scored in-process
+    PARALLEL_SENTIMENT_MIN = 8
+
+    def __init__(self, system_prompt="You are a helpful assistant.", data_storage=None,
+                 temperature=None, response_cache=None):
+        self._agents         = list()
+        self._system_prompt  = system_prompt
+        self._sentiment_pool = None  # created on first large sentiment batch
+        self._data_storage   = data_storage or JSONDataStorage()
+        self._temperature    = temperature
+        self._response_cache = response_cache
+        self._pending        = list()  # results of the current test, saved in one write
+        self._seen           = None    # result key -> agent names, read from storage on first use
+        # One connection pool for all Ollama agents of this framework;
+        # the async pool is opened per event loop by _async_client
+        self._client         = ollama.Client(**_ollama_client_options())
 
     def with_agent(self, agent):
         self._agents.append(agent)
         return self
 
     def with_ollama_agent(self, model):
-        agent = OllamaAgent(model, self._system_prompt)
+        agent = OllamaAgent(model, self._system_prompt, self._temperature, self._response_cache,
+                            client=self._client)
         self._agents.append(agent)
         return self
     
@@ -250,19 +381,103 @@ class TestFramework:
         return results
 
     def runN(self, n, prompt):
-        results = dict()
+        results = {agent: [None] * n for agent in self._agents}
         for i in range(n):
             for agent in self._agents:
-                response = agent.ask(prompt)
-                if agent not in results:
-                    results[agent] = list()
-                results[agent].append(response.content)
+                results[agent][i] = agent.ask(prompt).content
         return results
 
+    @contextlib.asynccontextmanager
+    async def _async_client(self):
+        """
+        Open one AsyncClient in the running event loop, share it with all
+        Ollama agents for the duration of the block and close it afterwards.
+        """
+        async with ollama.AsyncClient(**_ollama_client_options()) as aclient:
+            token = _ASYNC_CLIENT.set(aclient)
+            try:
+                yield aclient
+            finally:
+                _ASYNC_CLIENT.reset(token)
+
+    async def arunN(self, n, prompt):
+        """
+        Like runN, but sends all n * len(agents) requests concurrently.
+        Set OLLAMA_NUM_PARALLEL on the Ollama server so it actually
+        processes them in parallel.
+        """
+        async with self._async_client():
+            tasks     = [agent.aask(prompt) for _ in range(n) for agent in self._agents]
+            responses = await asyncio.gather(*tasks)
+        return self._group_responses(responses, n)
+
+    def _group_responses(self, responses, n):
+        # Responses are ordered run by run, agent by agent: k = i * len(agents) + j
+        n_agents = len(self._agents)
+        return {agent: [responses[i * n_agents + j].content for i in range(n)]
+                for j, agent in enumerate(self._agents)}
+
     def analyze_sentiment(self, text):
-        sentiment = self._sia.polarity_scores(text)
+        sentiment = get_sia().polarity_scores(text)
         return sentiment
 
+    def analyze_sentiments(self, texts):
+        """
+        Score a batch of texts with the shared analyzer.
+        Texts that only differ in whitespace are scored only once; larger
+        batches are spread over a pool of worker processes, as VADER
+        scoring is CPU-bound.
+        """
+        keys   = [_WS_RE.sub(" ", text).strip() for text in texts]
+        unique = list(dict.fromkeys(keys))
+
+        if len(unique) < self.PARALLEL_SENTIMENT_MIN:
+            scores = {text: self.analyze_sentiment(text) for text in unique}
+        else:
+            n_workers = os.cpu_count() or 1
+            if self._sentiment_pool is None:
+                self._sentiment_pool = ProcessPoolExecutor(max_workers=n_workers, initializer=_worker_init)
+            chunksize = max(1, min(16, len(unique) // n_workers))
+            scores    = dict(zip(unique, self._sentiment_pool.map(_score, unique, chunksize=chunksize)))
+
+        return [dict(scores[key]) for key in keys]
+
+    @staticmethod
+    def _result_key(base_prompt, comb):
+        # The same style set in another order counts as the same combination
+        style = ", ".join(sorted((comb or "").split(", ")))
+        return hashlib.sha256(f"{base_prompt}|{style}".encode()).hexdigest()
+
+    def _get_seen(self):
+        if self._seen is None:
+            self._seen = dict()
+            for result in self._data_storage.iter_test_results():
+                self._mark_seen(result.get('base_prompt'), result.get('style_combination'), result.get('agent_name'))
+        return self._seen
+
+    def _mark_seen(self, base_prompt, comb, agent_name):
+        self._get_seen().setdefault(self._result_key(base_prompt, comb), set()).add(agent_name)
+
+    def _already_tested(self, base_prompt, prompt, comb):
+        """
+        Check whether every current agent already has stored results
+        for this base prompt and style combination.
+        """
+        if not self._agents:
+            return False
+        names = self._get_seen().get(self._result_key(base_prompt, comb), ())
+        if all(agent.name() in names for agent in self._agents):
+            print(f"Skipping prompt, results already stored: {prompt}\n")
+            print("="*80)
+            return True
+        return False
+
+    def _build_task(self, base_prompt):
+        """Pick a style combination for a base prompt and build the full prompt."""
+        comb    = pick_random_combination()
+        suffix  = f" Please answer in a {comb} manner."
+        return base_prompt + suffix, comb
+
     def test(self, base_prompt, n_runs=3, save_data=True):
         """
         Run a test with a base prompt and random style combination.
@@ -272,31 +487,96 @@ class TestFramework:
             n_runs: Number of times to run the test with the same style combination
             save_data: Whether to save results to storage
         """
-        comb    = pick_random_combination()
-        prompt  = base_prompt
-        prompt += " Please answer in a {} manner.".format(comb)
-        print(f"Prompt: {prompt}\n")
-        results = self.runN(n_runs, prompt)
+        prompt, comb = self._build_task(base_prompt)
+        if self._already_tested(base_prompt, prompt, comb):
+            return
+        results      = self.runN(n_runs, prompt)
+        self._process_results(base_prompt, prompt, comb, results, save_data)
+
+    async def atest(self, base_prompt, n_runs=3, save_data=True):
+        """
+        Like test, but queries all agents and runs concurrently.
         
-        for agent, response_list in results.items():
-            for resp in response_list:
-                print(f"Agent: {agent.name()}\nResponse: {resp}\n")
-                sentiment = self.analyze_sentiment(resp)
-                print(f"Sentiment: {sentiment}\n")
-                
-                # Save test result
-                if save_data:
-                    test_data = {
-                        'base_prompt': base_prompt,
-                        'full_prompt': prompt,
-                        'style_combination': comb,
-                        'agent_name': agent.name(),
-                        'response': resp,
-                        'sentiment': sentiment
-                    }
-                    self._data_storage.save_test_result(test_data)
+        Args:
+            base_prompt: The base prompt to test
+            n_runs: Number of times to run the test with the same style combination
+            save_data: Whether to save results to storage
+        """
+        await self.run_all([base_prompt], n_runs, save_data)
+
+    async def run_all(self, base_prompts, n_runs=3, save_data=True, max_parallel=None):
+        """
+        Run tests for several base prompts with all requests in flight at once.
+        The (base prompt, run, agent) requests of all prompts are dispatched
+        together, bounded by a semaphore, so the Ollama server can batch them.
+        Each prompt's results are printed, scored and saved as soon as all of
+        its requests have finished; a prompt with a failed request is skipped
+        and reported without affecting the others.
+        
+        Args:
+            base_prompts: Base prompts to test
+            n_runs: Number of times to run each test with the same style combination
+            save_data: Whether to save results to storage
+            max_parallel: Maximum number of concurrent requests
+                          (default: OLLAMA_NUM_PARALLEL or 4)
+        """
+        if max_parallel is None:
+            max_parallel = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+        semaphore = asyncio.Semaphore(max_parallel)
+
+        async def bounded(agent, prompt):
+            async with semaphore:
+                return await agent.aask(prompt)
+
+        async def run_spec(spec):
+            _, prompt, _ = spec
+            tasks        = [bounded(agent, prompt) for _ in range(n_runs) for agent in self._agents]
+            return spec, await asyncio.gather(*tasks, return_exceptions=True)
+
+        specs = [(base_prompt, *self._build_task(base_prompt)) for base_prompt in base_prompts]
+        specs = [spec for spec in specs if not self._already_tested(*spec)]
+
+        async with self._async_client():
+            for next_done in asyncio.as_completed([run_spec(spec) for spec in specs]):
+                (base_prompt, prompt, comb), responses = await next_done
+                errors = [r for r in responses if isinstance(r, Exception)]
+                if errors:
+                    print(f"Skipping prompt, {len(errors)} of {len(responses)} requests failed "
+                          f"({errors[0]!r}): {prompt}\n")
+                    print("="*80)
+                    continue
+                results = self._group_responses(responses, n_runs)
+                self._process_results(base_prompt, prompt, comb, results, save_data)
+
+    def _process_results(self, base_prompt, prompt, comb, results, save_data):
+        flat       = [(agent, resp) for agent, response_list in results.items() for resp in response_list]
+        sentiments = self.analyze_sentiments([resp for _, resp in flat])
+        # Collect the output of the whole test and write it at once
+        buf        = [f"Prompt: {prompt}\n\n"]
+
+        for (agent, resp), sentiment in zip(flat, sentiments):
+            buf.append(f"Agent: {agent.name()}\nResponse: {resp}\n\n")
+            buf.append(f"Sentiment: {sentiment}\n\n")
+            
+            # Save test result
+            if save_data:
+                test_data = {
+                    'base_prompt': base_prompt,
+                    'full_prompt': prompt,
+                    'style_combination': comb,
+                    'agent_name': agent.name(),
+                    'response': resp,
+                    'sentiment': sentiment
+                }
+                self._pending.append(test_data)
+                self._mark_seen(base_prompt, comb, test_data['agent_name'])
+        
+        if self._pending:
+            self._data_storage.save_test_results_bulk(self._pending)
+            self._pending = list()
         
-        print("="*80)
+        buf.append("="*80 + "\n")
+        sys.stdout.write("".join(buf))
 
 
 if __name__ == "__main__":
@@ -322,6 +602,22 @@ if __name__ == "__main__":
         action='store_true',
         help='List all available Ollama models and exit'
     )
+    parser.add_argument(
+        '--temperature',
+        type=float,
+        default=None,
+        help='Sampling temperature passed to the models (default: model default)'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Cache responses across runs (only used with --temperature 0)'
+    )
+    parser.add_argument(
+        '--semantic-cache',
+        action='store_true',
+        help='Also answer from the cache for similar prompts via embeddings (may mix up style combinations)'
+    )
     parser.add_argument(
         '--debug',
         action='store_true',
@@ -368,20 +664,38 @@ if __name__ == "__main__":
     print(f"Testing with {len(models_to_use)} model(s): {', '.join(models_to_use)}")
     print()
     
+    # Response cache (only meaningful for deterministic generation)
+    response_cache = None
+    if args.cache:
+        if args.temperature == 0:
+            # Prompts only differ in their style suffix, so semantic hits are opt-in
+            if args.semantic_cache:
+                response_cache = ResponseCache(
+                    embed=lambda p: ollama.embeddings(model="nomic-embed-text", prompt=p)['embedding']
+                )
+            else:
+                response_cache = ResponseCache(similarity_threshold=None)
+        else:
+            print("Warning: --cache is ignored unless --temperature 0 is set.")
+
     # Create test framework
-    tf = TestFramework(system_prompt="You are a helpful assistant.")
+    tf = TestFramework(system_prompt="You are a helpful assistant.",
+                       temperature=args.temperature,
+                       response_cache=response_cache)
     
     # Add all models as agents
     for model in models_to_use:
         tf.with_ollama_agent(model)
     
-    # Run tests
-    tf.test("Please intoduce yourself.")
-    tf.test("Please tell me something about yourself.")
-    tf.test("How do I get to the nearest airport?") # Trick question - check for hallucinations
-    tf.test("What is the capital of France?")
-    tf.test("Explain the theory of relativity.")
-    tf.test("How does a blockchain work?")
-    tf.test("What is a transformer model?")
-    tf.test("Describe the process of photosynthesis.")
-    tf.test("Who was Leonardo da Vinci?")
+    # Run tests (all requests are dispatched together)
+    asyncio.run(tf.run_all([
+        "Please intoduce yourself.",
+        "Please tell me something about yourself.",
+        "How do I get to the nearest airport?", # Trick question - check for hallucinations
+        "What is the capital of France?",
+        "Explain the theory of relativity.",
+        "How does a blockchain work?",
+        "What is a transformer model?",
+        "Describe the process of photosynthesis.",
+        "Who was Leonardo da Vinci?",
+    ]))